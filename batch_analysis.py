@@ -0,0 +1,301 @@
+# batch_analysis.py
+# Run: python batch_analysis.py positions.txt [--depth 4] [--workers 4] [--out results.jsonl]
+# Python 3.9+
+#
+# Analyses a file of stored positions (e.g. every position from a tournament
+# game) and streams one JSON line per position with the best move, score,
+# depth reached, nodes searched and time taken.
+#
+# Input format: one position per line. Blank lines and lines starting with "#"
+# are skipped. Each line is either
+#   - a text board: 64 characters of ".", "B", "W" (row by row, spaces and "/"
+#     between rows are allowed), optionally followed by the side to move, e.g.
+#       ...........................WB......BW........................... B
+#   - a list board as used by the template, optionally followed by the side
+#     to move, e.g.
+#       [[".", ".", ...], ...] W
+# The side to move defaults to BLACK.
+#
+# Blank lines and "#" lines also mark game boundaries: the positions between
+# two separators are sent to one worker together (split into runs of at most
+# MAX_CHUNK_SIZE), so later positions of a game can reuse that worker's tables.
+#
+# Each worker process keeps one transposition table and one evaluation cache
+# for its whole lifetime. Both are cleared when they pass their caps; full
+# tables take about 320 bytes per TT entry and 175 bytes per eval-cache entry,
+# so at the default caps each worker holds at most about 50 MB of tables on top
+# of the interpreter. Only CHUNKS_IN_FLIGHT_PER_WORKER chunks per worker are
+# read ahead of the output, so memory stays bounded regardless of the input size.
+
+from __future__ import annotations
+import argparse
+import ast
+import json
+import math
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from FirstDraft_Reversi_Template import (
+    BLACK, EMPTY, WHITE, WEIGHTS, Move,
+    apply_move, evaluate, legal_moves, opponent,
+)
+
+# ---------------- CONFIG ----------------
+DEFAULT_DEPTH = 4
+DEFAULT_WORKERS = max(1, (multiprocessing.cpu_count() or 1) - 1)
+MAX_CHUNK_SIZE = 64        # most positions handed to a worker at once (a game is split if longer)
+CHUNKS_IN_FLIGHT_PER_WORKER = 4  # chunks read ahead of the output, per worker
+MAX_TT_ENTRIES = 100_000   # per worker; table is cleared when it grows past this
+MAX_EVAL_ENTRIES = 100_000 # per worker; cache is cleared when it grows past this
+# ---------------------------------------
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Per-process search state, shared by every position a worker analyses.
+# TT values are (depth, value, flag, best move as r * 8 + c or -1).
+_TT: Dict[Tuple[str, str], Tuple[int, float, int, int]] = {}
+_EVAL_CACHE: Dict[str, int] = {}
+
+
+# ---------- Input ----------
+
+def parse_position(line: str) -> Tuple[List[List[str]], str]:
+    """Parse one input line into (board, side_to_move). Raises ValueError on bad input."""
+    line = line.strip()
+    if line.startswith("["):
+        end = line.rfind("]")
+        if end < 0:
+            raise ValueError("unterminated list board")
+        try:
+            board = ast.literal_eval(line[:end + 1])
+        except (SyntaxError, ValueError, TypeError, MemoryError, RecursionError) as e:
+            raise ValueError(f"bad list board: {e}") from None
+        rest = line[end + 1:].split()
+        if (not isinstance(board, list) or len(board) != 8
+                or any(not isinstance(row, list) or len(row) != 8 for row in board)):
+            raise ValueError("list board must be 8 lists of 8 cells")
+        board = [[str(cell) for cell in row] for row in board]
+    else:
+        # Board tokens come first (rows may be split by spaces or "/"), then the optional side.
+        parts = line.split()
+        cells = ""
+        i = 0
+        while i < len(parts) and len(cells) < 64:
+            cells += parts[i].replace("/", "")
+            i += 1
+        if len(cells) != 64:
+            raise ValueError(f"text board must have 64 cells, got {len(cells)}")
+        rest = parts[i:]
+        board = [list(cells[r * 8:(r + 1) * 8]) for r in range(8)]
+
+    if any(cell not in (EMPTY, BLACK, WHITE) for row in board for cell in row):
+        raise ValueError(f"board cells must be one of {EMPTY!r}, {BLACK!r}, {WHITE!r}")
+    if len(rest) > 1:
+        raise ValueError("unexpected text after side to move")
+    player = rest[0].upper() if rest else BLACK
+    if player not in (BLACK, WHITE):
+        raise ValueError(f"side to move must be {BLACK!r} or {WHITE!r}")
+    return board, player
+
+
+def _read_chunks(f, max_size: int) -> Iterator[List[Tuple[int, str]]]:
+    chunk: List[Tuple[int, str]] = []
+    for lineno, line in enumerate(f, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            # game separator
+            if chunk:
+                yield chunk
+                chunk = []
+            continue
+        chunk.append((lineno, line))
+        if len(chunk) >= max_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def read_chunks(path: str, max_size: int = MAX_CHUNK_SIZE) -> Iterator[List[Tuple[int, str]]]:
+    """
+    Yield lists of (line_number, line), lazily. A chunk ends at a blank or
+    "#" line (a game boundary) or after max_size positions.
+    """
+    if path == "-":
+        yield from _read_chunks(sys.stdin, max_size)
+        return
+    with open(path) as f:
+        yield from _read_chunks(f, max_size)
+
+
+# ---------- Search ----------
+
+def _board_key(board: List[List[str]]) -> str:
+    return "".join("".join(row) for row in board)
+
+
+def _evaluate_cached(board: List[List[str]], key: str, player: str) -> int:
+    """evaluate() is antisymmetric, so cache it once per board from BLACK's side."""
+    val = _EVAL_CACHE.get(key)
+    if val is None:
+        if len(_EVAL_CACHE) >= MAX_EVAL_ENTRIES:
+            _EVAL_CACHE.clear()
+        val = evaluate(board, BLACK)
+        _EVAL_CACHE[key] = val
+    return val if player == BLACK else -val
+
+
+def _ordered(moves: List[Move], first: int) -> List[Move]:
+    """Sort by positional weight, with the TT move (r * 8 + c, or -1) first."""
+    return sorted(moves, key=lambda m: (m.r * 8 + m.c != first, -WEIGHTS[m.r][m.c]))
+
+
+def _negamax(board: List[List[str]], player: str, depth: int,
+             alpha: float, beta: float, stats: Dict[str, int]) -> Tuple[float, Optional[Move]]:
+    """Alpha-beta negamax with a transposition table. Score is from 'player' perspective."""
+    stats["nodes"] += 1
+    key = _board_key(board)
+    tt_key = (key, player)
+    entry = _TT.get(tt_key)
+    tt_move = -1
+    if entry is not None:
+        e_depth, e_val, e_flag, tt_move = entry
+        if e_depth >= depth:
+            if (e_flag == EXACT
+                    or (e_flag == LOWER and e_val >= beta)
+                    or (e_flag == UPPER and e_val <= alpha)):
+                return e_val, (None if tt_move < 0 else Move(tt_move // 8, tt_move % 8))
+
+    if depth == 0:
+        return _evaluate_cached(board, key, player), None
+
+    moves = legal_moves(board, player)
+    if not moves:
+        if not legal_moves(board, opponent(player)):
+            return _evaluate_cached(board, key, player), None
+        # pass turn
+        val, _ = _negamax(board, opponent(player), depth - 1, -beta, -alpha, stats)
+        return -val, None
+
+    alpha_orig = alpha
+    best_val = -math.inf
+    best_move = None
+    for m in _ordered(moves, tt_move):
+        val, _ = _negamax(apply_move(board, player, m), opponent(player), depth - 1, -beta, -alpha, stats)
+        val = -val
+        if val > best_val:
+            best_val = val
+            best_move = m
+        alpha = max(alpha, val)
+        if alpha >= beta:
+            break
+
+    if best_val <= alpha_orig:
+        flag = UPPER
+    elif best_val >= beta:
+        flag = LOWER
+    else:
+        flag = EXACT
+    if len(_TT) >= MAX_TT_ENTRIES:
+        _TT.clear()
+    _TT[tt_key] = (depth, best_val, flag, best_move.r * 8 + best_move.c)
+    return best_val, best_move
+
+
+def analyse_position(board: List[List[str]], player: str, depth: int = DEFAULT_DEPTH) -> Dict[str, object]:
+    """Iterative-deepening search of one position using this process's shared tables."""
+    stats = {"nodes": 0}
+    start = time.perf_counter()
+    best_move = None
+    score = None
+    reached = 0
+    if legal_moves(board, player):
+        for d in range(1, depth + 1):
+            score, best_move = _negamax(board, player, d, -math.inf, math.inf, stats)
+            reached = d
+    return {
+        "player": player,
+        "best_move": None if best_move is None else [best_move.r, best_move.c],
+        "score": score,
+        "depth": reached,
+        "nodes": stats["nodes"],
+        "time_ms": round((time.perf_counter() - start) * 1000, 3),
+    }
+
+
+def _analyse_line(lineno: int, line: str, depth: int) -> Dict[str, object]:
+    try:
+        board, player = parse_position(line)
+        result = analyse_position(board, player, depth)
+    except Exception as e:
+        # One bad line must not stop the batch.
+        return {"line": lineno, "error": f"{type(e).__name__}: {e}"}
+    result["line"] = lineno
+    return result
+
+
+def _analyse_chunk(job: Tuple[List[Tuple[int, str]], int]) -> List[Dict[str, object]]:
+    chunk, depth = job
+    return [_analyse_line(lineno, line, depth) for lineno, line in chunk]
+
+
+# ---------- Batch driver ----------
+
+def analyse_file(path: str, depth: int = DEFAULT_DEPTH, workers: int = DEFAULT_WORKERS) -> Iterator[Dict[str, object]]:
+    """
+    Yield one result dict per position in 'path', in input order.
+    At most CHUNKS_IN_FLIGHT_PER_WORKER chunks per worker are read but not yet
+    yielded, so the input file is never held in memory and the pool never
+    waits on a barrier.
+    """
+    if workers <= 1:
+        for chunk in read_chunks(path):
+            yield from _analyse_chunk((chunk, depth))
+        return
+
+    in_flight = threading.BoundedSemaphore(max(2, CHUNKS_IN_FLIGHT_PER_WORKER) * workers)
+
+    def jobs() -> Iterator[Tuple[List[Tuple[int, str]], int]]:
+        # Runs in the pool's task-feeding thread; blocks once the limit is reached.
+        for chunk in read_chunks(path):
+            in_flight.acquire()
+            yield chunk, depth
+
+    with multiprocessing.Pool(workers) as pool:
+        for results in pool.imap(_analyse_chunk, jobs()):
+            in_flight.release()
+            yield from results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Batch-analyse stored Reversi positions.")
+    parser.add_argument("positions", help="input file, one position per line ('-' for stdin)")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--out", default="-", help="output JSON lines file ('-' for stdout)")
+    args = parser.parse_args(argv)
+    if args.depth < 1:
+        parser.error("--depth must be at least 1")
+
+    out = sys.stdout if args.out == "-" else open(args.out, "w")
+    results = analyse_file(args.positions, args.depth, args.workers)
+    try:
+        for result in results:
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+    except BrokenPipeError:
+        # Reader went away (e.g. piped into head): stop quietly. Point stdout
+        # at devnull so the interpreter's final flush doesn't raise again.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    finally:
+        results.close()
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# bench_mailbox.py
+# Run: python bench_mailbox.py
+# Compares the template's move generator/search with mailbox_core.py on the
+# same positions: checks they agree, then reports speed and memory use.
+#
+# Memory figures are tracemalloc peaks (high-water mark above the starting
+# level), not totals: objects allocated and freed within the measured step
+# barely show up. "peak bytes / node" is for one node expansion (generate
+# moves, make/unmake each, evaluate) outside the search; "peak bytes / search"
+# is over a whole minimax_ai call, the real _max_value/_min_value path.
+# Python 3.9+
+
+import random
+import time
+import tracemalloc
+
+import FirstDraft_Reversi_Template as template
+import mailbox_core as mailbox
+
+# ---------------- CONFIG ----------------
+SEED = 5
+NUM_POSITIONS = 60
+SEARCH_DEPTH = 3
+# ---------------------------------------
+
+
+def sample_positions(n: int, seed: int):
+    """Random-playout positions from across the game, as (board, player) pairs."""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < n:
+        board = template.new_board()
+        player = template.BLACK
+        while not template.game_over(board) and len(positions) < n:
+            moves = template.legal_moves(board, player)
+            if not moves:
+                player = template.opponent(player)
+                continue
+            positions.append((board, player))
+            board = template.apply_move(board, player, rng.choice(moves))
+            player = template.opponent(player)
+    return positions
+
+
+def check_agreement(positions) -> None:
+    for board, player in positions:
+        moves = template.legal_moves(board, player)
+        assert mailbox.legal_moves(board, player) == moves
+        assert mailbox.evaluate(board, player) == template.evaluate(board, player)
+        for m in moves:
+            assert mailbox.discs_to_flip(board, player, m) == template.discs_to_flip(board, player, m)
+            assert mailbox.apply_move(board, player, m) == template.apply_move(board, player, m)
+        assert mailbox.game_over(board) == template.game_over(board)
+
+
+def expand_template(board, player) -> int:
+    """One node of the template's search: generate moves, play each, evaluate."""
+    moves = template.legal_moves(board, player)
+    for m in moves:
+        template.apply_move(board, player, m)
+    template.evaluate(board, player)
+    return len(moves)
+
+
+def expand_mailbox(flat, player, moves, flips) -> int:
+    """One node of mailbox_core's search, with preallocated buffers."""
+    opp = template.opponent(player)
+    n = mailbox.generate_moves(flat, player, opp, moves)
+    i = 0
+    while i < n:
+        k = mailbox.make_move(flat, moves[i], player, opp, flips)
+        mailbox.unmake_move(flat, moves[i], opp, flips, k)
+        i += 1
+    mailbox.evaluate_flat(flat, player, opp)
+    return n
+
+
+def peak_bytes(fn, args_list) -> float:
+    """Average tracemalloc peak (bytes above the starting level) of one fn(*args) call."""
+    total = 0
+    tracemalloc.start()
+    for args in args_list:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        fn(*args)
+        total += tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return total / len(args_list)
+
+
+def search_nodes(module, positions) -> float:
+    """Average minimax_ai node count, by counting _max_value/_min_value calls (untimed, untraced run)."""
+    count = 0
+    orig_max, orig_min = module._max_value, module._min_value
+
+    def counted(fn):
+        def wrapper(*args):
+            nonlocal count
+            count += 1
+            return fn(*args)
+        return wrapper
+
+    module._max_value, module._min_value = counted(orig_max), counted(orig_min)
+    try:
+        for board, player in positions:
+            module.minimax_ai(board, player, depth=SEARCH_DEPTH)
+    finally:
+        module._max_value, module._min_value = orig_max, orig_min
+    return count / len(positions)
+
+
+def search(ai):
+    return lambda board, player: ai(board, player, depth=SEARCH_DEPTH)
+
+
+def time_search(ai, positions):
+    start = time.perf_counter()
+    moves = [ai(board, player, depth=SEARCH_DEPTH) for board, player in positions]
+    return moves, time.perf_counter() - start
+
+
+def main():
+    positions = sample_positions(NUM_POSITIONS, SEED)
+    check_agreement(positions)
+    print(f"{len(positions)} positions: legal_moves/discs_to_flip/apply_move/evaluate agree")
+
+    moves = [0] * mailbox.MAX_MOVES
+    flips = [0] * mailbox.MAX_FLIPS
+    template_args = positions
+    mailbox_args = [(mailbox.to_flat(board), player, moves, flips) for board, player in positions]
+
+    # Warm up so one-off allocations (interned strings, code caches) aren't counted.
+    for args in mailbox_args:
+        expand_mailbox(*args)
+
+    t_bytes = peak_bytes(expand_template, template_args)
+    m_bytes = peak_bytes(expand_mailbox, mailbox_args)
+    t_search_bytes = peak_bytes(search(template.minimax_ai), positions)
+    m_search_bytes = peak_bytes(search(mailbox.minimax_ai), positions)
+    t_nodes = search_nodes(template, positions)
+    m_nodes = search_nodes(mailbox, positions)
+
+    start = time.perf_counter()
+    for args in template_args:
+        expand_template(*args)
+    t_exp = time.perf_counter() - start
+    start = time.perf_counter()
+    for args in mailbox_args:
+        expand_mailbox(*args)
+    m_exp = time.perf_counter() - start
+
+    t_moves, t_search = time_search(template.minimax_ai, positions)
+    m_moves, m_search = time_search(mailbox.minimax_ai, positions)
+    assert t_moves == m_moves, "minimax_ai chose different moves"
+
+    print(f"\n{'':24}{'template':>12}{'mailbox':>12}")
+    print(f"{'peak bytes / node':24}{t_bytes:12.1f}{m_bytes:12.1f}")
+    print(f"{'node expansion (us)':24}{t_exp / len(positions) * 1e6:12.1f}{m_exp / len(positions) * 1e6:12.1f}")
+    print(f"{'nodes / search':24}{t_nodes:12.1f}{m_nodes:12.1f}")
+    print(f"{'peak bytes / search':24}{t_search_bytes:12.1f}{m_search_bytes:12.1f}")
+    print(f"{f'minimax depth {SEARCH_DEPTH} (s)':24}{t_search:12.3f}{m_search:12.3f}")
+    print("\npeak bytes / node: one generate/make/unmake/evaluate step outside the search")
+    print("peak bytes / search: high-water mark over a whole minimax_ai call (not total allocation)")
+    print(f"\nminimax_ai chose the same move in all {len(positions)} positions "
+          f"({t_search / m_search:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
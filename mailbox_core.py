@@ -0,0 +1,342 @@
+# mailbox_core.py
+# Drop-in replacement for the template's move generator and minimax search.
+# Usage: from mailbox_core import legal_moves, apply_move, minimax_ai  (same signatures as the template)
+# Python 3.9+
+#
+# Internally the board is a flat 100-cell list: the 8x8 board surrounded by a
+# one-cell border of OUTSIDE sentinels, so square (r, c) lives at index
+# 10 * (r + 1) + (c + 1). Per-square ray tables are built once at import and
+# stop at the board edge, so the hot path never calls in_bounds().
+#
+# The search works on plain integer square indices and makes/unmakes moves in
+# place on one flat board, writing moves and flipped squares into buffers that
+# are allocated once per ply. No Move objects, lists or board copies are
+# created per node.
+#
+# The buffers and the wrappers' scratch board are module-level, so unlike the
+# template these functions are not reentrant or thread-safe.
+
+from __future__ import annotations
+from typing import List, Optional, Tuple
+import math
+
+from FirstDraft_Reversi_Template import (
+    BLACK, EMPTY, WHITE, WEIGHTS, DIRECTIONS, Move, opponent,
+)
+
+OUTSIDE = "#"
+
+def square(r: int, c: int) -> int:
+    return 10 * (r + 1) + (c + 1)
+
+def row_col(sq: int) -> Tuple[int, int]:
+    return sq // 10 - 1, sq % 10 - 1
+
+# Playable squares in row-major order.
+SQUARES: Tuple[int, ...] = tuple(square(r, c) for r in range(8) for c in range(8))
+
+def _build_weights() -> List[int]:
+    weights = [0] * 100
+    for r in range(8):
+        for c in range(8):
+            weights[square(r, c)] = WEIGHTS[r][c]
+    return weights
+
+# Flat positional weights, 0 on the border.
+FLAT_WEIGHTS = _build_weights()
+
+# Squares sorted by weight (stable, so ties stay row-major). Generating moves
+# in this order gives the same ordering the template gets from sorted(..., reverse=True).
+SQUARES_BY_WEIGHT: Tuple[int, ...] = tuple(sorted(SQUARES, key=lambda s: -FLAT_WEIGHTS[s]))
+
+def _build_rays() -> List[Tuple[Tuple[int, ...], ...]]:
+    rays: List[Tuple[Tuple[int, ...], ...]] = [()] * 100
+    for r in range(8):
+        for c in range(8):
+            sq_rays = []
+            for dr, dc in DIRECTIONS:
+                ray = []
+                rr, cc = r + dr, c + dc
+                while 0 <= rr < 8 and 0 <= cc < 8:
+                    ray.append(square(rr, cc))
+                    rr += dr
+                    cc += dc
+                # A ray needs at least one opponent disc plus one own disc to flip anything.
+                if len(ray) >= 2:
+                    sq_rays.append(tuple(ray))
+            rays[square(r, c)] = tuple(sq_rays)
+    return rays
+
+# RAYS[sq] -> tuple of rays, each ray the squares walked outward from sq up to the edge.
+RAYS = _build_rays()
+
+MAX_FLIPS = 64
+MAX_MOVES = 64
+# Longest possible line of play: 60 moves, each followed by at most one pass.
+MAX_PLIES = 2 * 60 + 8
+
+# ---------- Flat board core ----------
+# The hot loops below index tuples with while instead of using for, because
+# every for loop allocates an iterator object.
+
+def new_flat() -> List[str]:
+    return [OUTSIDE] * 100
+
+def to_flat(board: List[List[str]], out: Optional[List[str]] = None) -> List[str]:
+    """Copy a list board into a flat board (reusing 'out' if given)."""
+    if out is None:
+        out = new_flat()
+    for r in range(8):
+        row = board[r]
+        base = 10 * (r + 1) + 1
+        # Index assignment, so a malformed row can't resize 'out'.
+        for c in range(8):
+            out[base + c] = row[c]
+    return out
+
+def to_board(flat: List[str]) -> List[List[str]]:
+    return [flat[10 * (r + 1) + 1:10 * (r + 1) + 9] for r in range(8)]
+
+def collect_flips(flat: List[str], sq: int, player: str, opp: str, buf: List[int]) -> int:
+    """Write the squares 'player' would flip by playing 'sq' into buf; return how many."""
+    n = 0
+    rays = RAYS[sq]
+    nrays = len(rays)
+    j = 0
+    while j < nrays:
+        ray = rays[j]
+        j += 1
+        k = n
+        i = 0
+        end = len(ray)
+        while i < end:
+            s = ray[i]
+            v = flat[s]
+            if v == opp:
+                buf[k] = s
+                k += 1
+                i += 1
+                continue
+            if v == player:
+                n = k
+            break
+    return n
+
+def has_flips(flat: List[str], sq: int, player: str, opp: str) -> bool:
+    rays = RAYS[sq]
+    nrays = len(rays)
+    j = 0
+    while j < nrays:
+        ray = rays[j]
+        j += 1
+        if flat[ray[0]] != opp:
+            continue
+        i = 1
+        end = len(ray)
+        while i < end:
+            v = flat[ray[i]]
+            if v != opp:
+                if v == player:
+                    return True
+                break
+            i += 1
+    return False
+
+def generate_moves(flat: List[str], player: str, opp: str, out: List[int]) -> int:
+    """Write legal squares for 'player' into out, best positional weight first; return how many."""
+    n = 0
+    j = 0
+    while j < 64:
+        sq = SQUARES_BY_WEIGHT[j]
+        j += 1
+        if flat[sq] == EMPTY and has_flips(flat, sq, player, opp):
+            out[n] = sq
+            n += 1
+    return n
+
+def count_moves(flat: List[str], player: str, opp: str) -> int:
+    n = 0
+    j = 0
+    while j < 64:
+        sq = SQUARES[j]
+        j += 1
+        if flat[sq] == EMPTY and has_flips(flat, sq, player, opp):
+            n += 1
+    return n
+
+def make_move(flat: List[str], sq: int, player: str, opp: str, buf: List[int]) -> int:
+    """Play sq in place; flipped squares are left in buf for unmake_move. Returns flip count (0 = illegal, board untouched)."""
+    n = collect_flips(flat, sq, player, opp, buf)
+    if n:
+        flat[sq] = player
+        i = 0
+        while i < n:
+            flat[buf[i]] = player
+            i += 1
+    return n
+
+def unmake_move(flat: List[str], sq: int, opp: str, buf: List[int], n: int) -> None:
+    flat[sq] = EMPTY
+    i = 0
+    while i < n:
+        flat[buf[i]] = opp
+        i += 1
+
+def evaluate_flat(flat: List[str], player: str, opp: str) -> int:
+    """Same heuristic as the template's evaluate(), on a flat board."""
+    pos = 0
+    mine = 0
+    theirs = 0
+    j = 0
+    while j < 64:
+        sq = SQUARES[j]
+        j += 1
+        v = flat[sq]
+        if v == player:
+            pos += FLAT_WEIGHTS[sq]
+            mine += 1
+        elif v == opp:
+            pos -= FLAT_WEIGHTS[sq]
+            theirs += 1
+    mob = count_moves(flat, player, opp) - count_moves(flat, opp, player)
+    return pos + 8 * mob + (mine - theirs)
+
+# ---------- Search ----------
+
+class _Buffers:
+    """Per-ply move and flip buffers, grown to the deepest search seen so far."""
+    def __init__(self) -> None:
+        self.moves: List[List[int]] = []
+        self.flips: List[List[int]] = []
+
+    def ensure(self, plies: int) -> None:
+        while len(self.moves) < plies:
+            self.moves.append([0] * MAX_MOVES)
+            self.flips.append([0] * MAX_FLIPS)
+
+_BUFFERS = _Buffers()
+_FLAT = new_flat()     # scratch board for the list-board wrappers
+_FLIPS = [0] * MAX_FLIPS
+
+def _max_value(flat: List[str], root: str, to_move: str, depth: int, alpha: float, beta: float, ply: int) -> float:
+    opp = BLACK if to_move == WHITE else WHITE
+    if depth == 0:
+        return evaluate_flat(flat, root, BLACK if root == WHITE else WHITE)
+
+    moves = _BUFFERS.moves[ply]
+    n = generate_moves(flat, to_move, opp, moves)
+    if not n:
+        if not count_moves(flat, opp, to_move):
+            return evaluate_flat(flat, root, BLACK if root == WHITE else WHITE)
+        # pass turn
+        return _min_value(flat, root, opp, depth - 1, alpha, beta, ply + 1)
+
+    flips = _BUFFERS.flips[ply]
+    v = -math.inf
+    i = 0
+    while i < n:
+        sq = moves[i]
+        k = make_move(flat, sq, to_move, opp, flips)
+        val = _min_value(flat, root, opp, depth - 1, alpha, beta, ply + 1)
+        unmake_move(flat, sq, opp, flips, k)
+        if val > v:
+            v = val
+        if v >= beta:
+            return v
+        if v > alpha:
+            alpha = v
+        i += 1
+    return v
+
+def _min_value(flat: List[str], root: str, to_move: str, depth: int, alpha: float, beta: float, ply: int) -> float:
+    opp = BLACK if to_move == WHITE else WHITE
+    if depth == 0:
+        return evaluate_flat(flat, root, BLACK if root == WHITE else WHITE)
+
+    moves = _BUFFERS.moves[ply]
+    n = generate_moves(flat, to_move, opp, moves)
+    if not n:
+        if not count_moves(flat, opp, to_move):
+            return evaluate_flat(flat, root, BLACK if root == WHITE else WHITE)
+        # pass turn
+        return _max_value(flat, root, opp, depth - 1, alpha, beta, ply + 1)
+
+    flips = _BUFFERS.flips[ply]
+    v = math.inf
+    i = 0
+    while i < n:
+        sq = moves[i]
+        k = make_move(flat, sq, to_move, opp, flips)
+        val = _max_value(flat, root, opp, depth - 1, alpha, beta, ply + 1)
+        unmake_move(flat, sq, opp, flips, k)
+        if val < v:
+            v = val
+        if v <= alpha:
+            return v
+        if v < beta:
+            beta = v
+        i += 1
+    return v
+
+# ---------- Template API ----------
+
+def discs_to_flip(board: List[List[str]], player: str, move: Move) -> List[Tuple[int, int]]:
+    """Return list of coordinates that would be flipped if player plays move."""
+    if not (0 <= move.r < 8 and 0 <= move.c < 8) or board[move.r][move.c] != EMPTY:
+        return []
+    to_flat(board, _FLAT)
+    n = collect_flips(_FLAT, square(move.r, move.c), player, opponent(player), _FLIPS)
+    return [row_col(_FLIPS[i]) for i in range(n)]
+
+def legal_moves(board: List[List[str]], player: str) -> List[Move]:
+    """Legal moves in row-major order, like the template."""
+    to_flat(board, _FLAT)
+    opp = opponent(player)
+    return [Move(*row_col(sq)) for sq in SQUARES
+            if _FLAT[sq] == EMPTY and has_flips(_FLAT, sq, player, opp)]
+
+def apply_move(board: List[List[str]], player: str, move: Move) -> List[List[str]]:
+    if not (0 <= move.r < 8 and 0 <= move.c < 8) or board[move.r][move.c] != EMPTY:
+        raise ValueError("Illegal move")
+    to_flat(board, _FLAT)
+    if not make_move(_FLAT, square(move.r, move.c), player, opponent(player), _FLIPS):
+        raise ValueError("Illegal move")
+    return to_board(_FLAT)
+
+def game_over(board: List[List[str]]) -> bool:
+    to_flat(board, _FLAT)
+    return not count_moves(_FLAT, BLACK, WHITE) and not count_moves(_FLAT, WHITE, BLACK)
+
+def evaluate(board: List[List[str]], player: str) -> int:
+    """Heuristic evaluation from 'player' perspective."""
+    to_flat(board, _FLAT)
+    return evaluate_flat(_FLAT, player, opponent(player))
+
+def minimax_ai(board: List[List[str]], player: str, depth: int = 4) -> Optional[Move]:
+    """Minimax with alpha-beta pruning; picks the same move as the template's minimax_ai."""
+    flat = to_flat(board)
+    opp = opponent(player)
+    # depth <= 0 searches to game over, like the template.
+    _BUFFERS.ensure(depth + 2 if depth > 0 else MAX_PLIES)
+    moves = _BUFFERS.moves[0]
+    n = generate_moves(flat, player, opp, moves)
+    if not n:
+        return None
+
+    flips = _BUFFERS.flips[0]
+    best_sq = moves[0]
+    best_val = -math.inf
+    alpha = -math.inf
+    beta = math.inf
+
+    for i in range(n):
+        sq = moves[i]
+        k = make_move(flat, sq, player, opp, flips)
+        val = _min_value(flat, player, opp, depth - 1, alpha, beta, 1)
+        unmake_move(flat, sq, opp, flips, k)
+        if val > best_val:
+            best_val = val
+            best_sq = sq
+        alpha = max(alpha, best_val)
+
+    return Move(*row_col(best_sq))